@@ -0,0 +1 @@
+"""Shared circuit breaker used by the distributed service instances."""
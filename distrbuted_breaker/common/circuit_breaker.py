@@ -2,58 +2,89 @@
 Defines a simple circuit breaker implementation to manage the state of service calls in the other service instances.
 The CircuitBreaker class tracks the number of consecutive failures and manages state transitions between CLOSED, OPEN,
 and HALF_OPEN based on the configured failure threshold and recovery timeout.
+The module is fully annotated so it can be compiled to a C extension with
+`mypyc distrbuted_breaker/common/circuit_breaker.py` (run from the repository root);
+the compiled module is picked up in place of this file without any change to callers.
 """
+import logging
 import time
-from enum import Enum
+from enum import IntEnum
+from typing import Final
+
+# Breaker events go through logging rather than print; nothing is emitted unless the application configures a handler.
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+# Monotonic clock bound once at module level; only elapsed time matters, so wall-clock time is not needed.
+_now = time.monotonic
 
 # CircuitState defines the possible states of the circuit breaker: CLOSED, OPEN, and HALF_OPEN.
-class CircuitState(Enum):
-    CLOSED = "closed"
-    OPEN = "open"
-    HALF_OPEN = "half_open"
+class CircuitState(IntEnum):
+    CLOSED = 0
+    OPEN = 1
+    HALF_OPEN = 2
+
+# Human-readable state names for responses and output, looked up by state instead of carried on the enum.
+STATE_LABELS = {
+    CircuitState.CLOSED: "closed",
+    CircuitState.OPEN: "open",
+    CircuitState.HALF_OPEN: "half_open",
+}
+
+# Plain int copies of the state codes for the internal state, so hot-path checks are native int compares under mypyc.
+_CLOSED: Final = 0
+_OPEN: Final = 1
+_HALF_OPEN: Final = 2
+_STATE_MEMBERS: Final = (CircuitState.CLOSED, CircuitState.OPEN, CircuitState.HALF_OPEN)
 
 # CircuitBreaker class manages the state of the circuit and handles transitions based on success and failure of service calls.
 class CircuitBreaker:
-    def __init__(self, failure_threshold=3, recovery_timeout=5):
-        self.failure_threshold = failure_threshold
-        self.recovery_timeout = recovery_timeout
+    def __init__(self, failure_threshold: int = 3, recovery_timeout: float = 5) -> None:
+        self.failure_threshold: int = failure_threshold
+        self.recovery_timeout: float = recovery_timeout
+
+        self._state: int = _CLOSED
+        self.failure_count: int = 0
+        self.last_failure_time: float = 0.0
 
-        self.state = CircuitState.CLOSED
-        self.failure_count = 0
-        self.last_failure_time = None
+    # Current state as a CircuitState member, for callers that report it (e.g. STATE_LABELS[cb.state]).
+    @property
+    def state(self) -> CircuitState:
+        return _STATE_MEMBERS[self._state]
 
     # Allow a request if the circuit is CLOSED or if it's HALF_OPEN (allowing a test request). If OPEN, check if the recovery timeout has elapsed to transition to HALF_OPEN.
-    def allow_request(self):
-        if self.state == CircuitState.OPEN:
-            elapsed = time.time() - self.last_failure_time
+    def allow_request(self) -> bool:
+        if self._state == _OPEN:
+            elapsed = _now() - self.last_failure_time
             if elapsed >= self.recovery_timeout:
-                self.state = CircuitState.HALF_OPEN
-                print("⚠️ HALF_OPEN")
+                self._state = _HALF_OPEN
+                logger.info("⚠️ HALF_OPEN")
                 return True
             return False
         return True
 
     # Record a successful service call. If the circuit is HALF_OPEN, transition back to CLOSED. Otherwise, reset the failure count.
-    def record_success(self):
-        if self.state == CircuitState.HALF_OPEN:
-            self.state = CircuitState.CLOSED
+    def record_success(self) -> None:
+        if self._state == _HALF_OPEN:
+            self._state = _CLOSED
             self.failure_count = 0
-            print("✅ CLOSED")
+            logger.info("✅ CLOSED")
         else:
             self.failure_count = 0
 
     # Record a failed service call. If the circuit is HALF_OPEN, transition to OPEN. If the failure count exceeds the threshold, transition to OPEN.
-    def record_failure(self):
+    def record_failure(self) -> None:
         self.failure_count += 1
-        print(f"❌ Failure count: {self.failure_count}")
 
-        if self.state == CircuitState.HALF_OPEN:
-            self.state = CircuitState.OPEN
-            self.last_failure_time = time.time()
-            print("🚨 OPEN")
+        if self._state == _HALF_OPEN:
+            self._state = _OPEN
+            self.last_failure_time = _now()
+            logger.info("🚨 OPEN")
             return
 
         if self.failure_count >= self.failure_threshold:
-            self.state = CircuitState.OPEN
-            self.last_failure_time = time.time()
-            print("🚨 OPEN")
+            # Failures past the threshold keep the circuit OPEN and restart the recovery window; only the first one logs.
+            if self._state != _OPEN:
+                logger.info("🚨 OPEN")
+            self._state = _OPEN
+            self.last_failure_time = _now()
@@ -0,0 +1 @@
+"""Redis-backed circuit breaker and its Lua scripts, shared by the service instances."""
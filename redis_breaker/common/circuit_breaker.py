@@ -5,21 +5,87 @@ allowing multiple service instances to share the same state and coordinate their
 success or failure of service calls. The circuit breaker transitions between CLOSED, OPEN, and HALF_OPEN states based on 
 the configured failure threshold and recovery timeout, and provides methods to allow or block requests accordingly.
 """
+import logging
+import random
 import time
-from enum import Enum
+from enum import IntEnum
 import redis
-from redis_scripts import OPEN_SCRIPT, FAILURE_SCRIPT, HALF_OPEN_SCRIPT
+from .redis_scripts import OPEN_SCRIPT, FAILURE_SCRIPT, SUCCESS_SCRIPT, ALLOW_SCRIPT
+
+# Breaker events go through logging rather than print; nothing is emitted unless the application configures a handler.
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+# Monotonic clock for the local state cache; timestamps shared through Redis come from the Redis server clock instead.
+_now = time.monotonic
 
 # CircuitState defines the possible states of the circuit breaker: CLOSED, OPEN, and HALF_OPEN.
-class CircuitState(Enum):
-    CLOSED = "closed"
-    OPEN = "open"
-    HALF_OPEN = "half_open"
+class CircuitState(IntEnum):
+    CLOSED = 0
+    OPEN = 1
+    HALF_OPEN = 2
+
+# Human-readable state names for responses and output, looked up by state instead of carried on the enum.
+STATE_LABELS = {
+    CircuitState.CLOSED: "closed",
+    CircuitState.OPEN: "open",
+    CircuitState.HALF_OPEN: "half_open",
+}
+
+# Integer state codes as stored in Redis, and a cached lookup from those codes back to CircuitState members.
+_CLOSED = int(CircuitState.CLOSED)
+_OPEN = int(CircuitState.OPEN)
+_HALF_OPEN = int(CircuitState.HALF_OPEN)
+_STATES = {int(state): state for state in CircuitState}
+
+# One Redis client (on its own connection pool) per process and Redis endpoint, shared by every breaker, together with
+# the Lua scripts registered on it, so scripts are hashed and registered once per process instead of once per breaker.
+_CONNECTIONS = {}
+
+# Get (or create) the shared client and registered scripts for a Redis endpoint. A UNIX socket path, when given, is used instead of TCP.
+# When max_connections is reached under concurrent load, the pool waits up to 1 second for a free connection, then raises.
+# Scripts run via EVALSHA and are loaded again automatically if Redis answers NOSCRIPT (e.g. after a restart).
+def _get_connection(host, port, socket_path, max_connections=64):
+    endpoint = (host, port, socket_path)
+    connection = _CONNECTIONS.get(endpoint)
+    if connection is None:
+        if socket_path:
+            pool = redis.BlockingConnectionPool(
+                connection_class=redis.UnixDomainSocketConnection,
+                path=socket_path,
+                max_connections=max_connections,
+                timeout=1,
+                socket_timeout=1,
+                decode_responses=True,
+            )
+        else:
+            pool = redis.BlockingConnectionPool(
+                host=host,
+                port=port,
+                max_connections=max_connections,
+                timeout=1,
+                socket_keepalive=True,
+                socket_timeout=1,
+                decode_responses=True,
+            )
+        client = redis.Redis(connection_pool=pool)
+        connection = (
+            client,
+            client.register_script(OPEN_SCRIPT),
+            client.register_script(FAILURE_SCRIPT),
+            client.register_script(SUCCESS_SCRIPT),
+            client.register_script(ALLOW_SCRIPT),
+        )
+        _CONNECTIONS[endpoint] = connection
+    return connection
 
 # CircuitBreaker class manages the state of the circuit and handles transitions based on success and failure of service calls.
 class RedisCircuitBreaker:
     # Initialize the circuit breaker with a service name, failure threshold, recovery timeout, and Redis connection parameters. 
+    # Pass redis_socket_path to talk to a co-located Redis over its UNIX socket instead of TCP localhost.
     # The service name is used to create unique keys in Redis for tracking the state and failures of the circuit breaker.
+    # state_cache_ttl is how long (in seconds) a state seen from Redis is trusted locally before Redis is asked again.
+    # probe_jitter is the upper bound (in seconds) of the random delay added to the local OPEN window, so instances don't all probe at once.
     def __init__(
         self,
         service_name,
@@ -27,115 +93,129 @@ class RedisCircuitBreaker:
         recovery_timeout=10,
         redis_host="localhost",
         redis_port=6379,
+        redis_socket_path=None,
+        state_cache_ttl=0.1,
+        probe_jitter=0.5,
     ):
         self.service_name = service_name
         self.failure_threshold = failure_threshold
         self.recovery_timeout = recovery_timeout
+        self.recovery_timeout_ms = int(recovery_timeout * 1000)
+        self.state_cache_ttl = state_cache_ttl
+        self.probe_jitter = probe_jitter
 
+        # Last state seen from Redis and the monotonic time until which it can be reused without a round trip.
+        self._state_cache = (None, 0.0)
+        # Monotonic time until which this instance knows the circuit is OPEN and blocks without asking Redis.
+        self._open_until_local = 0.0
 
-        # Initialize Redis client and set up keys for state, failure count, and last failure time.
-        self.redis = redis.Redis(host=redis_host, port=redis_port, decode_responses=True)
-        self.open_script = self.redis.register_script(OPEN_SCRIPT)
-        self.failure_script = self.redis.register_script(FAILURE_SCRIPT)
-        self.half_open_script = self.redis.register_script(HALF_OPEN_SCRIPT)
+        # Use the process-wide Redis client and scripts, and set up the hash key holding state, failure count, and last failure time.
+        (
+            self.redis,
+            self.open_script,
+            self.failure_script,
+            self.success_script,
+            self.allow_script,
+        ) = _get_connection(redis_host, redis_port, redis_socket_path)
 
 
-        self.state_key = f"cb:{service_name}:state"
-        self.failure_key = f"cb:{service_name}:failures"
-        self.time_key = f"cb:{service_name}:last_failure"
+        self.hash_key = f"cb:{service_name}"
+        self.probe_lock_key = f"{service_name}:probe_lock"
 
         # Ensure that the circuit breaker state is initialized in Redis if it doesn't already exist.
-        if not self.redis.exists(self.state_key):
-            self.redis.set(self.state_key, CircuitState.CLOSED.value)
-            self.redis.set(self.failure_key, 0)
-
-    # Get the current state of the circuit breaker from Redis.
+        # Both HSETNX calls go out in one pipelined round trip and never overwrite state written by another instance.
+        with self.redis.pipeline(transaction=False) as pipe:
+            pipe.hsetnx(self.hash_key, "state", _CLOSED)
+            pipe.hsetnx(self.hash_key, "failures", 0)
+            pipe.execute()
+
+    # Block locally for the given number of seconds plus a random jitter, so instances spread out their probes.
+    def _hold_open(self, seconds):
+        self._open_until_local = _now() + seconds + random.uniform(0, self.probe_jitter)
+
+    # Remember a state returned by Redis so that requests within the next state_cache_ttl seconds can skip Redis.
+    def _cache_state(self, state):
+        self._state_cache = (state, _now() + self.state_cache_ttl)
+        return state
+
+    # Get the current state of the circuit breaker, from the local cache if it is still fresh, otherwise from Redis.
     def get_state(self):
-        state = self.redis.get(self.state_key)
-        return CircuitState(state)
+        state, expires_at = self._state_cache
+        if _now() < expires_at:
+            return state
+
+        return self._cache_state(_STATES[int(self.redis.hget(self.hash_key, "state"))])
 
     # Determine if a request should be allowed based on the current state of the circuit. If the circuit is OPEN, check if the recovery timeout has elapsed to transition to HALF_OPEN.
     # In the OPEN state, only one request is allowed to pass through as a probe to test if the service has recovered. If the probe request is successful, the circuit transitions back to CLOSED. If it fails, the circuit remains OPEN.
+    # The whole decision (state check, timeout check, probe lock and HALF_OPEN promotion) runs as a single atomic script.
+    # Returns (allowed, state) so a blocked response can report the state without another Redis round trip.
+    # While the circuit is known to be OPEN (see _hold_open) the request is blocked without touching Redis.
+    # While the cached state is fresh the decision is made locally: CLOSED lets the request through, anything else blocks it.
     def allow_request(self):
-        state = self.get_state()
-
-        if state == CircuitState.OPEN:
-            last_failure = self.redis.get(self.time_key)
-            if not last_failure:
-                return False
+        now = _now()
+        if now < self._open_until_local:
+            return False, CircuitState.OPEN
 
-            elapsed = time.time() - float(last_failure)
+        state, expires_at = self._state_cache
+        if now < expires_at:
+            return state is CircuitState.CLOSED, state
 
-            if elapsed < self.recovery_timeout:
-                return False
-
-            # STEP 1: Try to acquire probe lock
-            lock_acquired = self.redis.set(
-                f"{self.service_name}:probe_lock",
-                "1",
-                nx=True,
-                ex=5
-            )
-
-            if not lock_acquired:
-                return False  # Someone else is probing
-
-            # STEP 2: Transition to HALF_OPEN safely
-            transitioned = self.half_open_script(
-                keys=[self.state_key],
-                args=[CircuitState.OPEN.value, CircuitState.HALF_OPEN.value],
-            )
-
-            if transitioned:
-                print("⚠️ HALF_OPEN (Probe Leader)")
-                return True
-            else:
-                return False
+        allowed, state, remaining_ms = self.allow_script(
+            keys=[self.hash_key, self.probe_lock_key],
+            args=[self.recovery_timeout_ms, _CLOSED, _OPEN, _HALF_OPEN],
+        )
 
-        if state == CircuitState.HALF_OPEN:
-            return False
+        if allowed and state == _HALF_OPEN:
+            logger.info("⚠️ HALF_OPEN (Probe Leader)")
+        elif not allowed and state == _OPEN:
+            self._hold_open(remaining_ms / 1000)
 
-        return True
+        return bool(allowed), self._cache_state(_STATES[state])
 
 
     # Record a successful service call. If the circuit is HALF_OPEN, transition back to CLOSED. Otherwise, reset the failure count.
+    # Returns the resulting state so callers don't need a follow-up get_state().
     def record_success(self):
-        state = self.get_state()
+        closed, state = self.success_script(
+            keys=[self.hash_key, self.probe_lock_key],
+            args=[_HALF_OPEN, _CLOSED],
+        )
 
-        if state == CircuitState.HALF_OPEN:
-            self.redis.set(self.state_key, CircuitState.CLOSED.value)
-            self.redis.set(self.failure_key, 0)
-            self.redis.delete(f"{self.service_name}:probe_lock")
-            print("✅ CLOSED (Shared)")
-        else:
-            self.redis.set(self.failure_key, 0)
+        if closed:
+            logger.info("✅ CLOSED (Shared)")
+            self._open_until_local = 0.0
+
+        return self._cache_state(_STATES[state])
 
 
     # Record a failed service call. If the circuit is HALF_OPEN, transition to OPEN immediately. If the failure count exceeds the threshold, transition to OPEN.
+    # Returns the resulting state so callers don't need a follow-up get_state().
     def record_failure(self):
-        failures = self.failure_script(
-            keys=[
-                self.failure_key,
-                self.state_key,
-                self.time_key,
-                f"{self.service_name}:probe_lock",
-            ],
-            args=[
-                self.failure_threshold,
-                CircuitState.OPEN.value,
-                time.time(),
-            ],
+        failures, state, opened = self.failure_script(
+            keys=[self.hash_key, self.probe_lock_key],
+            args=[self.failure_threshold, _OPEN, _HALF_OPEN],
         )
 
-        print(f"❌ Shared Failure count: {failures}")
+        # Only the call that actually opens the circuit logs it; per-failure counts are not logged.
+        if opened:
+            logger.info("🚨 OPEN (Shared)")
+
+        # A failure that leaves the circuit OPEN has just stamped last_failure, so the full recovery window lies ahead.
+        if state == _OPEN:
+            self._hold_open(self.recovery_timeout)
+
+        return self._cache_state(_STATES[state])
 
 
     # Transition the circuit to OPEN state, recording the time of the last failure.
     def _open(self):
         self.open_script(
-            keys=[self.state_key, self.time_key, f"{self.service_name}:probe_lock"],
-            args=[CircuitState.OPEN.value, time.time()],
+            keys=[self.hash_key, self.probe_lock_key],
+            args=[_OPEN],
         )
-        print("🚨 OPEN (Atomic Shared)")
+        self._cache_state(CircuitState.OPEN)
+        self._hold_open(self.recovery_timeout)
+        logger.info("🚨 OPEN (Atomic Shared)")
 
 
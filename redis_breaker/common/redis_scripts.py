@@ -1,55 +1,115 @@
 """
 Redis Lua scripts for atomic operations in the circuit breaker.
+All breaker state lives in one hash (fields: state, failures, last_failure); the probe lock
+stays a separate key so it can expire on its own. States are stored, passed and returned as
+integer codes (0 = closed, 1 = open, 2 = half_open).
+Timestamps are integer milliseconds read from the Redis server clock (TIME), so every instance
+shares one clock and no timestamp is sent from Python.
+"""
+
+# Lua prelude shared by the scripts that need the current time: sets now_ms from Redis TIME.
+_NOW_MS = """
+local now = redis.call("TIME")
+local now_ms = tonumber(now[1]) * 1000 + math.floor(tonumber(now[2]) / 1000)
 """
 
 """
 For OPEN_SCRIPT:
-KEYS[1] → state_key
-KEYS[2] → time_key
-KEYS[3] → probe_lock_key
-ARGV[1] → "open"
-ARGV[2] → timestamp
+KEYS[1] → hash_key
+KEYS[2] → probe_lock_key
+ARGV[1] → open state code
 """
 
-OPEN_SCRIPT = """
-redis.call("SET", KEYS[1], ARGV[1])
-redis.call("SET", KEYS[2], ARGV[2])
-redis.call("DEL", KEYS[3])
+OPEN_SCRIPT = _NOW_MS + """
+redis.call("HSET", KEYS[1], "state", ARGV[1], "last_failure", now_ms)
+redis.call("DEL", KEYS[2])
 return 1
 """
 
 """
 For FAILURE_SCRIPT:
-KEYS[1] → failure_key
-KEYS[2] → state_key
-KEYS[3] → time_key
-KEYS[4] → probe_lock_key
+KEYS[1] → hash_key
+KEYS[2] → probe_lock_key
 ARGV[1] → failure_threshold
-ARGV[2] → "open"
-ARGV[3] → timestamp
+ARGV[2] → open state code
+ARGV[3] → half_open state code
+Returns {failures, state, opened} where opened is 1 only if this call moved the circuit to OPEN.
+A failure in HALF_OPEN (the probe failing) reopens the circuit whatever the failure count is.
 """
 
 FAILURE_SCRIPT = """
-local failures = redis.call("INCR", KEYS[1])
-if failures >= tonumber(ARGV[1]) then
-    redis.call("SET", KEYS[2], ARGV[2])
-    redis.call("SET", KEYS[3], ARGV[3])
-    redis.call("DEL", KEYS[4])
+local failures = redis.call("HINCRBY", KEYS[1], "failures", 1)
+local state = tonumber(redis.call("HGET", KEYS[1], "state"))
+if state == tonumber(ARGV[3]) or failures >= tonumber(ARGV[1]) then
+""" + _NOW_MS + """
+    redis.call("HSET", KEYS[1], "state", ARGV[2], "last_failure", now_ms)
+    redis.call("DEL", KEYS[2])
+    if state == tonumber(ARGV[2]) then
+        return {failures, state, 0}
+    end
+    return {failures, tonumber(ARGV[2]), 1}
 end
-return failures
+return {failures, state, 0}
 """
 
 """
-For HALF_OPEN_SCRIPT:
-KEYS[1] → state_key
-ARGV[1] → lock_value
-ARGV[2] → "half_open" (new state)
+For SUCCESS_SCRIPT:
+KEYS[1] → hash_key
+KEYS[2] → probe_lock_key
+ARGV[1] → half_open state code
+ARGV[2] → closed state code
+Returns {closed, state} where closed is 1 only if this call moved HALF_OPEN → CLOSED.
+The failure count is only reset in CLOSED or HALF_OPEN; a late success from a request that was
+already in flight when the circuit opened must not reset the count of an OPEN circuit.
 """
 
-HALF_OPEN_SCRIPT = """
-if redis.call("GET", KEYS[1]) == ARGV[1] then
-    redis.call("SET", KEYS[1], ARGV[2])
-    return 1
+SUCCESS_SCRIPT = """
+local state = tonumber(redis.call("HGET", KEYS[1], "state"))
+if state == tonumber(ARGV[1]) then
+    redis.call("HSET", KEYS[1], "state", ARGV[2], "failures", 0)
+    redis.call("DEL", KEYS[2])
+    return {1, tonumber(ARGV[2])}
+end
+if state == tonumber(ARGV[2]) then
+    redis.call("HSET", KEYS[1], "failures", 0)
+end
+return {0, state}
+"""
+
+"""
+For ALLOW_SCRIPT:
+KEYS[1] → hash_key
+KEYS[2] → probe_lock_key
+ARGV[1] → recovery_timeout_ms
+ARGV[2] → closed state code
+ARGV[3] → open state code
+ARGV[4] → half_open state code
+Returns {allowed, state, remaining_ms} where remaining_ms is how long an OPEN circuit still has
+before the recovery timeout elapses (0 otherwise). Once the recovery timeout has elapsed, only the
+caller that wins the probe lock is promoted OPEN → HALF_OPEN and allowed through.
+The common CLOSED case returns after a single HGET; last_failure and TIME are only read when OPEN.
+"""
+
+ALLOW_SCRIPT = """
+local state = tonumber(redis.call("HGET", KEYS[1], "state"))
+if state == tonumber(ARGV[2]) then
+    return {1, state, 0}
+end
+if state ~= tonumber(ARGV[3]) then
+    return {0, state, 0}
+end
+local last_failure = tonumber(redis.call("HGET", KEYS[1], "last_failure"))
+if not last_failure then
+    return {0, state, 0}
+end
+""" + _NOW_MS + """
+local remaining_ms = tonumber(ARGV[1]) - (now_ms - last_failure)
+if remaining_ms > 0 then
+    return {0, state, remaining_ms}
+end
+if not redis.call("SET", KEYS[2], "1", "NX", "EX", 5) then
+    return {0, state, 0}
 end
-return 0
+redis.call("HSET", KEYS[1], "state", ARGV[4])
+return {1, tonumber(ARGV[4]), 0}
 """
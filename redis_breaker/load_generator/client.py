@@ -1,10 +1,12 @@
 """
 Docstring for distrbuted_breaker.load_generator.client
-It randomly selects a target instance(A/B/C) and prints the response or any errors encountered.
+It randomly selects target instances(A/B/C) in batches, fans the calls out over a thread pool
+and prints the responses or any errors encountered.
 """
 import requests
+from requests.adapters import HTTPAdapter
 import random
-import time
+from concurrent.futures import ThreadPoolExecutor
 
 instances = [
     "http://localhost:8001/call",
@@ -12,12 +14,25 @@ instances = [
     "http://localhost:8003/call",
 ]
 
-while True:
-    target = random.choice(instances)
+BATCH_SIZE = 100
+MAX_WORKERS = 64
+
+# Reuse one session across all workers so each instance keeps a pool of warm connections
+session = requests.Session()
+session.mount("http://", HTTPAdapter(pool_connections=len(instances), pool_maxsize=MAX_WORKERS))
+
+# Send a single request to the target instance and return its JSON body or the error.
+def send(target):
     try:
-        response = requests.get(target)
-        print(response.json())
+        response = session.get(target, timeout=2)
+        return response.json()
     except Exception as e:
-        print("Error:", e)
+        return f"Error: {e}"
+
 
-    time.sleep(1)
+with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+    while True:
+        # Pick the whole batch of targets up front instead of one random.choice per request
+        targets = random.choices(instances, k=BATCH_SIZE)
+        for result in pool.map(send, targets):
+            print(result)
@@ -2,57 +2,76 @@
 This Flask application represents a service instance (Instance-C) that uses a Redis-based circuit breaker to manage calls to an unreliable service.
 It exposes an endpoint (/call) that simulates calling the unreliable service and demonstrates the behavior of the circuit breaker by allowing or blocking requests based on the current state of the circuit.
 """
-from flask import Flask, jsonify
-import requests
-import sys
+# Patch blocking sockets first so downstream and Redis calls yield to other requests instead of stalling the worker.
+from gevent import monkey
+monkey.patch_all()
+
+from flask import Flask, Response
+import logging
 import os
+import orjson
+import requests
+from requests.adapters import HTTPAdapter
 
-sys.path.append(os.path.abspath("../common"))
-from circuit_breaker import RedisCircuitBreaker
+from redis_breaker.common.circuit_breaker import RedisCircuitBreaker, STATE_LABELS
 
 from instance_config import INSTANCE_NAME, PORT
 
 app = Flask(__name__)
-cb = RedisCircuitBreaker(service_name="unreliable_service", failure_threshold=3, recovery_timeout=10)
+cb = RedisCircuitBreaker(
+    service_name="unreliable_service",
+    failure_threshold=3,
+    recovery_timeout=10,
+    redis_socket_path=os.environ.get("REDIS_SOCKET_PATH"),
+)
+
+# Shared HTTP session so calls to the unreliable service reuse pooled keep-alive connections
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=32, pool_maxsize=128, max_retries=0))
+SESSION.trust_env = False
+
+# The downstream request never changes, so prepare it once and resend it on every /call
+DOWNSTREAM_REQUEST = SESSION.prepare_request(requests.Request("GET", "http://localhost:9000/data"))
+
+# Every response body is one of a few (status, state) combinations, so serialize them all once with orjson
+RESPONSE_BODIES = {
+    (status, state): orjson.dumps({"instance": INSTANCE_NAME, "status": status, "state": label})
+    for status in ("blocked", "success", "failure", "exception")
+    for state, label in STATE_LABELS.items()
+}
+
+# Build the JSON response for a status/state pair from its pre-serialized body
+def _json_response(status, state, code=200):
+    return Response(RESPONSE_BODIES[(status, state)], status=code, mimetype="application/json")
 
 # Endpoint to call the unreliable service and demonstrate circuit breaker behavior
 @app.route("/call")
 def call_service():
-    if not cb.allow_request():
-        return jsonify({
-            "instance": INSTANCE_NAME,
-            "status": "blocked",
-            "state": cb.get_state().value
-        }), 503
+    allowed, state = cb.allow_request()
+    if not allowed:
+        return _json_response("blocked", state, 503)
 
     try:
         # Make a request to the unreliable service with a timeout to simulate potential failures
-        response = requests.get("http://localhost:9000/data", timeout=1)
+        response = SESSION.send(DOWNSTREAM_REQUEST, timeout=1)
 
         if response.status_code == 200:
-            cb.record_success()
-            return jsonify({
-                "instance": INSTANCE_NAME,
-                "status": "success",
-                "state": cb.get_state().value
-            })
+            state = cb.record_success()
+            return _json_response("success", state)
 
         else:
-            cb.record_failure()
-            return jsonify({
-                "instance": INSTANCE_NAME,
-                "status": "failure",
-                "state": cb.get_state().value
-            }), 500
+            state = cb.record_failure()
+            return _json_response("failure", state, 500)
 
     except Exception:
-        cb.record_failure()
-        return jsonify({
-            "instance": INSTANCE_NAME,
-            "status": "exception",
-            "state": cb.get_state().value
-        }), 500
+        state = cb.record_failure()
+        return _json_response("exception", state, 500)
 
 
 if __name__ == "__main__":
-    app.run(port=PORT)
+    # Show breaker state transitions on the console.
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    # Serve with gevent so one slow downstream call doesn't block every other /call.
+    # For a multi-worker setup: gunicorn -k gevent -w 1 --worker-connections 1000 -b 127.0.0.1:<PORT> app:app
+    from gevent.pywsgi import WSGIServer
+    WSGIServer(("127.0.0.1", PORT), app).serve_forever()
@@ -1,12 +1,27 @@
 # A simple implementation of the Circuit Breaker pattern in Python.
+import logging
 import time, random
-from enum import Enum
+from enum import IntEnum
+
+# Breaker events go through logging rather than print; nothing is emitted unless the application configures a handler.
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+# Monotonic clock bound once at module level; only elapsed time matters, so wall-clock time is not needed.
+_now = time.monotonic
 
 # CircuitState defines the possible states of the circuit breaker: CLOSED, OPEN, and HALF_OPEN.
-class CircuitState(Enum):
-    CLOSED = "closed"
-    OPEN = "open"
-    HALF_OPEN = "half_open"
+class CircuitState(IntEnum):
+    CLOSED = 0
+    OPEN = 1
+    HALF_OPEN = 2
+
+# Human-readable state names for responses and output, looked up by state instead of carried on the enum.
+STATE_LABELS = {
+    CircuitState.CLOSED: "closed",
+    CircuitState.OPEN: "open",
+    CircuitState.HALF_OPEN: "half_open",
+}
 
 # CircuitBreaker class manages the state of the circuit and handles transitions based on success and failure of service calls.
 class CircuitBreaker:
@@ -27,25 +42,25 @@ class CircuitBreaker:
     # Transition the circuit to OPEN state, recording the time of the last failure.
     def _transition_to_open(self):
         self.state = CircuitState.OPEN
-        self.last_failure_time = time.time()
-        print("🚨 Circuit transitioned to OPEN")
+        self.last_failure_time = _now()
+        logger.info("🚨 Circuit transitioned to OPEN")
 
     # Transition the circuit to HALF_OPEN state, allowing a test request to check if the service has recovered.
     def _transition_to_half_open(self):
         self.state = CircuitState.HALF_OPEN
-        print("⚠️ Circuit transitioned to HALF_OPEN")
+        logger.info("⚠️ Circuit transitioned to HALF_OPEN")
 
     # Transition the circuit back to CLOSED state, resetting failure count and last failure time.
     def _transition_to_closed(self):
         self.state = CircuitState.CLOSED
         self.failure_count = 0
         self.last_failure_time = None
-        print("✅ Circuit transitioned to CLOSED")
+        logger.info("✅ Circuit transitioned to CLOSED")
 
     # Determine if a request should be allowed based on the current state of the circuit.
     def allow_request(self):
         if self.state == CircuitState.OPEN: # If the circuit is OPEN, check if the recovery timeout has elapsed to transition to HALF_OPEN.
-            elapsed = time.time() - self.last_failure_time
+            elapsed = _now() - self.last_failure_time
             if elapsed >= self.recovery_timeout:
                 self._transition_to_half_open()
                 return True
@@ -63,7 +78,7 @@ class CircuitBreaker:
     # Record a failed service call. If the circuit is HALF_OPEN, transition to OPEN immediately. If the failure count exceeds the threshold, transition to OPEN.
     def record_failure(self):
         self.failure_count += 1
-        print(f"❌ Failure count = {self.failure_count}")
+        logger.debug("❌ Failure count = %d", self.failure_count)
 
         if self.state == CircuitState.HALF_OPEN:
             self._transition_to_open()
@@ -97,6 +112,9 @@ def call_service(cb: CircuitBreaker):
 
 
 if __name__ == "__main__":
+    # Show breaker transitions and failure counts alongside the demo output.
+    logging.basicConfig(level=logging.DEBUG, format="%(message)s")
+
     # Create a CircuitBreaker instance with a failure threshold of 3 and a recovery timeout of 5 seconds. 
     cb = CircuitBreaker(
         failure_threshold=3,
@@ -105,6 +123,6 @@ if __name__ == "__main__":
 
     # Then, simulate 20 attempts to call the service, printing the state of the circuit breaker before each attempt and sleeping for 1 second between attempts.
     for i in range(20):
-        print(f"\n--- Attempt {i + 1} --- State: {cb.state.value}")
+        print(f"\n--- Attempt {i + 1} --- State: {STATE_LABELS[cb.state]}")
         call_service(cb)
         time.sleep(1) # Sleep for a bit before the next attempt to simulate time passing and allow for recovery if the circuit is OPEN.